@@ -0,0 +1,52 @@
+"""
+JIT-compiled kernels for the scalar 4D interpolation path.
+
+Numba is optional: without it the kernels run as plain Python functions.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba not installed
+    def njit(*args, **kwargs):
+        """Fallback decorator that leaves the function uncompiled."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def interp(pts, node_fracs, start, end, t):
+    """
+    Interpolate a drone position at time t.
+    
+    Args:
+        pts: (N, 3) float64 waypoint coordinates
+        node_fracs: (N,) float64 fraction of the mission elapsed at each waypoint
+        start: Mission start time
+        end: Mission end time
+        t: Query time
+    
+    Returns:
+        Tuple (x, y, z, valid); valid is False outside the mission window
+    """
+    if t < start or t > end:
+        return 0.0, 0.0, 0.0, False
+    
+    n = pts.shape[0]
+    duration = end - start
+    if n == 1 or node_fracs[n - 1] == 0.0 or duration <= 0.0:
+        # Stationary or zero-duration mission
+        return pts[0, 0], pts[0, 1], pts[0, 2], True
+    
+    # Binary search for the segment active at this point of the mission
+    progress = (t - start) / duration
+    i = min(max(np.searchsorted(node_fracs, progress) - 1, 0), n - 2)
+    
+    df = node_fracs[i + 1] - node_fracs[i]
+    frac = (progress - node_fracs[i]) / df if df > 0.0 else 0.0
+    return (pts[i, 0] + (pts[i + 1, 0] - pts[i, 0]) * frac,
+            pts[i, 1] + (pts[i + 1, 1] - pts[i, 1]) * frac,
+            pts[i, 2] + (pts[i + 1, 2] - pts[i, 2]) * frac,
+            True)
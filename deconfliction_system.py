@@ -1,6 +1,9 @@
+import math
+from collections import OrderedDict
 import numpy as np
-from typing import List, Optional, Dict
-from models import Waypoint, Mission, Conflict
+from typing import List, Optional, Dict, Tuple
+from models import Waypoint, Mission, ConflictWindow, CONFLICT_RECORD_DTYPE
+from deconfliction_numba import interp
 
 
 class DeconflictionSystem:
@@ -10,6 +13,9 @@ class DeconflictionSystem:
     This system performs 4D (3D space + time) conflict detection.
     """
     
+    # Most recently used time grids kept for reuse across checks
+    TIME_GRID_CACHE_SIZE = 32
+    
     def __init__(self, safety_buffer: float = 50.0, time_resolution: float = 1.0):
         """
         Initialize the deconfliction system.
@@ -20,11 +26,14 @@ class DeconflictionSystem:
         """
         self.safety_buffer = safety_buffer
         self.time_resolution = time_resolution
-        self.conflicts: List[Conflict] = []
+        # Raw conflict records (structured array, see CONFLICT_RECORD_DTYPE)
+        self.conflicts: np.ndarray = np.empty(0, dtype=CONFLICT_RECORD_DTYPE)
+        # LRU of time grids keyed by (start, end, resolution), shared across checks
+        self._time_grid_cache: "OrderedDict[Tuple[float, float, float], np.ndarray]" = OrderedDict()
         
     def distance_3d(self, p1: Waypoint, p2: Waypoint) -> float:
         """Calculate 3D Euclidean distance between two waypoints."""
-        return np.linalg.norm(p1.to_array() - p2.to_array())
+        return math.hypot(p1.x - p2.x, p1.y - p2.y, p1.z - p2.z)
     
     def interpolate_position(self, mission: Mission, current_time: float) -> Optional[Waypoint]:
         """
@@ -32,88 +41,65 @@ class DeconflictionSystem:
         
         This is the core 4D function: calculates 3D position as a function of time.
         """
-        if current_time < mission.start_time or current_time > mission.end_time:
+        mission._ensure_arrays()
+        x, y, z, valid = interp(mission._pts, mission._node_fracs,
+                                float(mission.start_time), float(mission.end_time),
+                                float(current_time))
+        if not valid:
             return None
+        return Waypoint(x, y, z)
+    
+    def interpolate_positions(self, mission: Mission, times: np.ndarray) -> np.ndarray:
+        """
+        Vectorized 4D interpolation of drone positions over many time steps.
         
-        total_distance = self._calculate_path_length(mission.waypoints)
-        time_elapsed = current_time - mission.start_time
-        total_duration = mission.end_time - mission.start_time
-        progress = time_elapsed / total_duration
-        target_distance = progress * total_distance
+        Returns:
+            Array of shape (len(times), 3); rows outside the mission window are NaN
+        """
+        times = np.asarray(times, dtype=np.float64)
+        positions = np.full((len(times), 3), np.nan)
+        active = (times >= mission.start_time) & (times <= mission.end_time)
+        if not active.any():
+            return positions
         
-        accumulated_distance = 0.0
-        for i in range(len(mission.waypoints) - 1):
-            segment_length = self.distance_3d(mission.waypoints[i], mission.waypoints[i + 1])
-            
-            if accumulated_distance + segment_length >= target_distance:
-                segment_progress = (target_distance - accumulated_distance) / segment_length
-                return self._lerp_waypoint(
-                    mission.waypoints[i],
-                    mission.waypoints[i + 1],
-                    segment_progress
-                )
-            
-            accumulated_distance += segment_length
+        mission._ensure_arrays()
+        pts, node_fracs = mission._pts, mission._node_fracs
+        duration = mission.end_time - mission.start_time
+        if len(pts) == 1 or node_fracs[-1] == 0.0 or duration <= 0:
+            # Stationary or zero-duration mission
+            positions[active] = pts[0]
+            return positions
         
-        return mission.waypoints[-1]
-    
-    def _calculate_path_length(self, waypoints: List[Waypoint]) -> float:
-        """Calculate total length of path through waypoints."""
-        length = 0.0
-        for i in range(len(waypoints) - 1):
-            length += self.distance_3d(waypoints[i], waypoints[i + 1])
-        return length
-    
-    def _lerp_waypoint(self, p1: Waypoint, p2: Waypoint, t: float) -> Waypoint:
-        """Linear interpolation between two waypoints."""
-        return Waypoint(
-            x=p1.x + (p2.x - p1.x) * t,
-            y=p1.y + (p2.y - p1.y) * t,
-            z=p1.z + (p2.z - p1.z) * t
-        )
+        # Locate the active segment for every time step at once
+        progress = (times[active] - mission.start_time) / duration
+        idx = np.clip(np.searchsorted(node_fracs, progress, side='right') - 1, 0, len(pts) - 2)
+        df = node_fracs[idx + 1] - node_fracs[idx]
+        frac = np.divide(progress - node_fracs[idx], df, out=np.zeros_like(progress), where=df > 0)
+        positions[active] = pts[idx] + frac[:, None] * (pts[idx + 1] - pts[idx])
+        return positions
     
     def check_mission(self, primary_mission: Mission, 
-                     simulated_flights: List[Mission]) -> Dict:
+                     simulated_flights: List[Mission],
+                     exact: bool = False) -> Dict:
         """
         Main deconfliction check - 4D spatiotemporal analysis.
         
+        Args:
+            primary_mission: Mission to verify
+            simulated_flights: Other flights sharing the airspace
+            exact: Solve every overlapping segment pair in closed form instead
+                   of sampling at time_resolution (no conflicts between steps)
+        
         Returns:
             Dictionary containing status, conflicts, and summary
         """
-        self.conflicts = []
+        self.conflicts = np.empty(0, dtype=CONFLICT_RECORD_DTYPE)
         
-        # 4D analysis: check each time step
-        current_time = primary_mission.start_time
-        while current_time <= primary_mission.end_time:
-            primary_pos = self.interpolate_position(primary_mission, current_time)
-            
-            if primary_pos is None:
-                current_time += self.time_resolution
-                continue
-            
-            for flight in simulated_flights:
-                other_pos = self.interpolate_position(flight, current_time)
-                
-                if other_pos is None:
-                    continue
-                
-                distance = self.distance_3d(primary_pos, other_pos)
-                
-                if distance < self.safety_buffer:
-                    conflict = Conflict(
-                        time=current_time,
-                        location=primary_pos,
-                        distance=distance,
-                        primary_position=primary_pos,
-                        other_position=other_pos,
-                        flight_id=flight.mission_id,
-                        flight_name=flight.mission_id
-                    )
-                    self.conflicts.append(conflict)
-            
-            current_time += self.time_resolution
-        
-        consolidated_conflicts = self._consolidate_conflicts(self.conflicts)
+        if exact:
+            windows = self._check_exact(primary_mission, simulated_flights)
+        else:
+            windows = self._check_sampled(primary_mission, simulated_flights)
+        consolidated_conflicts = [window.to_dict() for window in windows]
         summary = self._generate_summary(consolidated_conflicts)
         
         return {
@@ -122,38 +108,258 @@ class DeconflictionSystem:
             'summary': summary
         }
     
-    def _consolidate_conflicts(self, conflicts: List[Conflict]) -> List[Dict]:
-        """Consolidate consecutive conflicts into time windows."""
-        if not conflicts:
+    def _time_grid(self, start_time: float, end_time: float) -> np.ndarray:
+        """Return the (read-only, cached) sampling times for a mission window."""
+        key = (float(start_time), float(end_time), float(self.time_resolution))
+        times = self._time_grid_cache.get(key)
+        if times is not None:
+            self._time_grid_cache.move_to_end(key)
+            return times
+        
+        times = np.arange(start_time, end_time + self.time_resolution,
+                          self.time_resolution)
+        times = times[times <= end_time]
+        times.flags.writeable = False
+        self._time_grid_cache[key] = times
+        if len(self._time_grid_cache) > self.TIME_GRID_CACHE_SIZE:
+            self._time_grid_cache.popitem(last=False)
+        return times
+    
+    def _check_sampled(self, primary_mission: Mission,
+                       simulated_flights: List[Mission]) -> List[ConflictWindow]:
+        """
+        Time-stepped check at time_resolution.
+        
+        All time steps are evaluated at once: positions for every flight are
+        interpolated over the full time grid and compared against the primary
+        in a single (flights x time steps) distance computation.
+        """
+        # 4D analysis: evaluate every time step of the primary mission
+        times = self._time_grid(primary_mission.start_time, primary_mission.end_time)
+        primary_positions = self.interpolate_positions(primary_mission, times)
+        
+        # (F, T, 3) positions of every simulated flight; NaN while not airborne
+        others = np.full((len(simulated_flights), len(times), 3), np.nan)
+        for f, flight in enumerate(simulated_flights):
+            others[f] = self.interpolate_positions(flight, times)
+        
+        # (F, T) separation matrix in a single broadcast;
+        # einsum reduces x/y/z without a temporary square
+        diff = others - primary_positions[None]
+        distances = np.nan_to_num(np.sqrt(np.einsum('ftk,ftk->ft', diff, diff)), nan=np.inf)
+        
+        # Copy violating (flight, time step) entries into one structured buffer;
+        # np.nonzero is row-major, so records are grouped by flight, then time
+        flight_idx, time_idx = np.nonzero(distances < self.safety_buffer)
+        records = np.empty(len(flight_idx), dtype=CONFLICT_RECORD_DTYPE)
+        records['time'] = times[time_idx]
+        records['flight_idx'] = flight_idx
+        records['distance'] = distances[flight_idx, time_idx]
+        records['x'], records['y'], records['z'] = primary_positions[time_idx].T
+        self.conflicts = records
+        
+        return self._consolidate_conflicts(records, simulated_flights)
+    
+    def _segment_schedule(self, mission: Mission):
+        """
+        Constant-speed schedule of a mission's segments.
+        
+        Returns:
+            Tuple of segment start points (K, 3), end points (K, 3),
+            start times (K,) and end times (K,)
+        """
+        t_nodes = mission._node_times()
+        pts = mission._pts
+        if len(pts) == 1 or t_nodes[-1] == t_nodes[0]:
+            # Stationary or instantaneous: a single fixed point over the window
+            anchor = pts[:1]
+            return (anchor, anchor,
+                    np.array([float(mission.start_time)]),
+                    np.array([float(mission.end_time)]))
+        
+        return pts[:-1], pts[1:], t_nodes[:-1], t_nodes[1:]
+    
+    def _segment_point(self, seg_start: np.ndarray, seg_end: np.ndarray,
+                       t0: float, t1: float, t: float) -> Tuple[float, float, float]:
+        """Position on a constant-speed segment at time t (clamped to the segment)."""
+        frac = min(max((t - t0) / (t1 - t0), 0.0), 1.0) if t1 > t0 else 0.0
+        x, y, z = (seg_start + (seg_end - seg_start) * frac).tolist()
+        return x, y, z
+    
+    def _segment_pair_conflict(self, seg_p_start: np.ndarray, seg_p_end: np.ndarray,
+                               tp0: float, tp1: float,
+                               seg_o_start: np.ndarray, seg_o_end: np.ndarray,
+                               to0: float, to1: float) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Closed-form separation check for two linearly moving drones.
+        
+        The relative position over the shared time interval is
+        d(t) = d0 + dv * (t - t_lo), so |d(t)|^2 is a quadratic in t whose
+        minimum and buffer crossings can be solved directly.
+        
+        Returns:
+            (entry_time, exit_time, time_of_min, min_distance) if the
+            separation drops below the safety buffer, otherwise None
+        """
+        tp0, tp1, to0, to1 = float(tp0), float(tp1), float(to0), float(to1)
+        t_lo = max(tp0, to0)
+        t_hi = min(tp1, to1)
+        if t_lo > t_hi:
+            return None
+        
+        # Scalar math on plain floats: 3-vector ndarray ops cost more in dispatch than math
+        kp = 1.0 / (tp1 - tp0) if tp1 > tp0 else 0.0
+        ko = 1.0 / (to1 - to0) if to1 > to0 else 0.0
+        a = b = c = 0.0
+        for ps, pe, os_, oe in zip(seg_p_start.tolist(), seg_p_end.tolist(),
+                                   seg_o_start.tolist(), seg_o_end.tolist()):
+            vp = (pe - ps) * kp
+            vo = (oe - os_) * ko
+            d0 = (ps + vp * (t_lo - tp0)) - (os_ + vo * (t_lo - to0))
+            dv = vp - vo
+            a += dv * dv
+            b += d0 * dv
+            c += d0 * d0
+        span = t_hi - t_lo
+        
+        s_min = min(max(-b / a, 0.0), span) if a > 0 else 0.0
+        min_distance = math.sqrt(max(a * s_min * s_min + 2 * b * s_min + c, 0.0))
+        if min_distance >= self.safety_buffer:
+            return None
+        
+        # Roots of a*s^2 + 2*b*s + (c - buffer^2) = 0 bound the violation
+        if a > 0:
+            root = math.sqrt(max(b * b - a * (c - self.safety_buffer ** 2), 0.0))
+            s_in = max((-b - root) / a, 0.0)
+            s_out = min((-b + root) / a, span)
+        else:
+            s_in, s_out = 0.0, span
+        
+        return t_lo + s_in, t_lo + s_out, t_lo + s_min, min_distance
+    
+    def _broad_phase(self, primary_segments, schedules) -> List[List[Tuple[int, int]]]:
+        """
+        Prune segment pairs with 4D (x, y, z, t) bounding boxes.
+        
+        Primary boxes are expanded by the safety buffer, so any pair that can
+        violate it has intersecting boxes. All flights are tested in a single
+        broadcast over (primary segments x all other segments).
+        
+        Returns:
+            For each flight, (primary_segment, other_segment) index pairs
+        """
+        candidates = [[] for _ in schedules]
+        if not schedules:
+            return candidates
+        
+        ps, pe, tp0, tp1 = primary_segments
+        p_lo = np.minimum(ps, pe) - self.safety_buffer
+        p_hi = np.maximum(ps, pe) + self.safety_buffer
+        
+        owner = np.concatenate([np.full(len(s[2]), f) for f, s in enumerate(schedules)])
+        local = np.concatenate([np.arange(len(s[2])) for s in schedules])
+        os_ = np.concatenate([s[0] for s in schedules])
+        oe = np.concatenate([s[1] for s in schedules])
+        to0 = np.concatenate([s[2] for s in schedules])
+        to1 = np.concatenate([s[3] for s in schedules])
+        o_lo = np.minimum(os_, oe)
+        o_hi = np.maximum(os_, oe)
+        
+        overlap = ((p_lo[:, None] <= o_hi[None]).all(-1) &
+                   (o_lo[None] <= p_hi[:, None]).all(-1) &
+                   (tp0[:, None] <= to1[None]) &
+                   (to0[None] <= tp1[:, None]))
+        
+        for i, k in zip(*np.nonzero(overlap)):
+            candidates[owner[k]].append((int(i), int(local[k])))
+        return candidates
+    
+    def _check_exact(self, primary_mission: Mission,
+                     simulated_flights: List[Mission]) -> List[ConflictWindow]:
+        """Exact conflict windows from every candidate segment pair."""
+        consolidated = []
+        records = []
+        primary_segments = self._segment_schedule(primary_mission)
+        schedules = [self._segment_schedule(flight) for flight in simulated_flights]
+        candidates = self._broad_phase(primary_segments, schedules)
+        
+        for f, flight in enumerate(simulated_flights):
+            ps, pe, tp0, tp1 = primary_segments
+            os_, oe, to0, to1 = schedules[f]
+            windows = []
+            for i, j in candidates[f]:
+                hit = self._segment_pair_conflict(ps[i], pe[i], tp0[i], tp1[i],
+                                                  os_[j], oe[j], to0[j], to1[j])
+                if hit is not None:
+                    # Positions come from the same primary segment the solver used
+                    entry, exit_, t_min, dist = hit
+                    windows.append([entry, exit_, t_min, dist,
+                                    self._segment_point(ps[i], pe[i], tp0[i], tp1[i], entry),
+                                    self._segment_point(ps[i], pe[i], tp0[i], tp1[i], t_min)])
+            if not windows:
+                continue
+            
+            # Merge windows that touch across segment boundaries
+            windows.sort(key=lambda w: w[0])
+            merged = [windows[0]]
+            for window in windows[1:]:
+                current = merged[-1]
+                if window[0] <= current[1] + 1e-9:
+                    current[1] = max(current[1], window[1])
+                    if window[3] < current[3]:
+                        current[2], current[3], current[5] = window[2], window[3], window[5]
+                else:
+                    merged.append(window)
+            
+            for entry, exit_, t_min, dist, entry_xyz, min_xyz in merged:
+                records.append((t_min, f, dist, *min_xyz))
+                consolidated.append(ConflictWindow(
+                    start_time=entry,
+                    end_time=exit_,
+                    location=Waypoint(*entry_xyz),
+                    min_distance=dist,
+                    flight_id=flight.mission_id,
+                    flight_name=flight.mission_id
+                ))
+        
+        # One record per window, at the closest approach
+        self.conflicts = np.array(records, dtype=CONFLICT_RECORD_DTYPE)
+        return consolidated
+    
+    def _consolidate_conflicts(self, records: np.ndarray,
+                               simulated_flights: List[Mission]) -> List[ConflictWindow]:
+        """
+        Consolidate consecutive conflicts into time windows.
+        
+        Records must be grouped by flight and sorted by time. A new window
+        starts wherever the flight changes or the gap to the previous hit
+        exceeds 2 * time_resolution; each window is then reduced in one pass.
+        """
+        if len(records) == 0:
             return []
         
+        flight_idx = records['flight_idx']
+        times = records['time']
+        new_window = np.r_[True, (np.diff(flight_idx) != 0) |
+                                 (np.diff(times) > 2 * self.time_resolution)]
+        starts = np.flatnonzero(new_window)
+        ends = np.r_[starts[1:], len(records)] - 1
+        min_distances = np.minimum.reduceat(records['distance'], starts)
+        
         consolidated = []
-        current = {
-            'start_time': conflicts[0].time,
-            'end_time': conflicts[0].time,
-            'location': conflicts[0].location,
-            'min_distance': conflicts[0].distance,
-            'flight_id': conflicts[0].flight_id,
-            'flight_name': conflicts[0].flight_name
-        }
+        for start, end, min_distance in zip(starts.tolist(), ends.tolist(),
+                                            min_distances.tolist()):
+            record = records[start]
+            flight = simulated_flights[record['flight_idx']]
+            consolidated.append(ConflictWindow(
+                start_time=float(record['time']),
+                end_time=float(times[end]),
+                location=Waypoint(float(record['x']), float(record['y']), float(record['z'])),
+                min_distance=min_distance,
+                flight_id=flight.mission_id,
+                flight_name=flight.mission_id
+            ))
         
-        for conflict in conflicts[1:]:
-            if (conflict.flight_id == current['flight_id'] and 
-                conflict.time - current['end_time'] <= 2 * self.time_resolution):
-                current['end_time'] = conflict.time
-                current['min_distance'] = min(current['min_distance'], conflict.distance)
-            else:
-                consolidated.append(current.copy())
-                current = {
-                    'start_time': conflict.time,
-                    'end_time': conflict.time,
-                    'location': conflict.location,
-                    'min_distance': conflict.distance,
-                    'flight_id': conflict.flight_id,
-                    'flight_name': conflict.flight_name
-                }
-        
-        consolidated.append(current)
         return consolidated
     
     def _generate_summary(self, conflicts: List[Dict]) -> Dict:
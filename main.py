@@ -1,3 +1,8 @@
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
 from deconfliction_system import DeconflictionSystem
 from visualizer import Visualizer
 from scenarios import (
@@ -41,7 +46,7 @@ def run_scenario(name, primary, simulated, system, visualizer, scenario_num):
 
     # Animated visualization (time-evolving 4D behavior)
     anim_path = f'output/{scenario_prefix}_animation.gif'
-    print(f"Creating animation (this may take a moment)...")
+    print(f"Creating animation...")
     visualizer.create_animation(primary, simulated, result, save_path=anim_path)
 
     print(f"\n✓ Scenario {scenario_num} complete!")
@@ -49,6 +54,24 @@ def run_scenario(name, primary, simulated, system, visualizer, scenario_num):
     print(f"  - Animation: {anim_path}")
 
 
+def _run_one(job):
+    # Worker entry point: builds its own system and visualizer (nothing is
+    # shared across processes) and returns the captured console output so
+    # the parent prints scenarios in order instead of interleaved
+    name, primary, simulated, safety_buffer, time_resolution, scenario_num = job
+
+    system = DeconflictionSystem(
+        safety_buffer=safety_buffer,
+        time_resolution=time_resolution
+    )
+    visualizer = Visualizer(system)
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        run_scenario(name, primary, simulated, system, visualizer, scenario_num)
+    return output.getvalue()
+
+
 def main():
     
     print_header()
@@ -59,55 +82,49 @@ def main():
         time_resolution=1.0      # seconds
     )
 
-    # Visualization layer (consumes analysis output only)
-    visualizer = Visualizer(system)
-
     print(f"System Configuration:")
     print(f"  • Safety Buffer: {system.safety_buffer}m")
     print(f"  • Time Resolution: {system.time_resolution}s")
     print(f"  • Analysis Mode: 4D (3D Space + Time)")
 
-    # ------------------------------------------------------------------
-    # Scenario 1: Guaranteed conflict case
-    # Validates detection of spatial-temporal safety violations
-    # ------------------------------------------------------------------
-    primary1, simulated1 = create_conflict_scenario()
-    run_scenario(
-        "CONFLICT DETECTION",
-        primary1,
-        simulated1,
-        system,
-        visualizer,
-        scenario_num=1
-    )
-
-    # ------------------------------------------------------------------
-    # Scenario 2: Fully safe mission
-    # Validates absence of false positives
-    # ------------------------------------------------------------------
-    primary2, simulated2 = create_clear_scenario()
-    run_scenario(
-        "CLEAR MISSION",
-        primary2,
-        simulated2,
-        system,
-        visualizer,
-        scenario_num=2
-    )
-
-    # ------------------------------------------------------------------
-    # Scenario 3: Near-miss case
-    # Validates threshold-based safety buffer enforcement
-    # ------------------------------------------------------------------
-    primary3, simulated3 = create_near_miss_scenario()
-    run_scenario(
-        "NEAR MISS",
-        primary3,
-        simulated3,
-        system,
-        visualizer,
-        scenario_num=3
-    )
+    scenarios = [
+        # --------------------------------------------------------------
+        # Scenario 1: Guaranteed conflict case
+        # Validates detection of spatial-temporal safety violations
+        # --------------------------------------------------------------
+        ("CONFLICT DETECTION", *create_conflict_scenario()),
+
+        # --------------------------------------------------------------
+        # Scenario 2: Fully safe mission
+        # Validates absence of false positives
+        # --------------------------------------------------------------
+        ("CLEAR MISSION", *create_clear_scenario()),
+
+        # --------------------------------------------------------------
+        # Scenario 3: Near-miss case
+        # Validates threshold-based safety buffer enforcement
+        # --------------------------------------------------------------
+        ("NEAR MISS", *create_near_miss_scenario()),
+    ]
+
+    jobs = [
+        (name, primary, simulated, system.safety_buffer, system.time_resolution, num)
+        for num, (name, primary, simulated) in enumerate(scenarios, 1)
+    ]
+
+    # Scenarios are independent and CPU-bound (GIF rendering dominates),
+    # so run them in parallel. 'spawn' avoids forking matplotlib state.
+    # Worker output is captured until each scenario finishes, so report
+    # progress from the parent before dispatching
+    print(f"\nRunning {len(jobs)} scenarios in parallel "
+          f"(rendering animations may take a moment)...")
+    for name, *_, num in jobs:
+        print(f"  • Started scenario {num}: {name}")
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=len(jobs), mp_context=context) as executor:
+        for output in executor.map(_run_one, jobs):
+            print(output, end='')
 
     # Final execution summary
     print("\n" + "=" * 70)
@@ -2,14 +2,28 @@
 Data models for the deconfliction system.
 """
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
 import numpy as np
 
 
-@dataclass
+# Raw per-timestep conflict record (one row per violating flight/time step).
+# Distances and coordinates stay float64 since they feed the report.
+CONFLICT_RECORD_DTYPE = np.dtype([
+    ('time', 'f8'),
+    ('flight_idx', 'i4'),
+    ('distance', 'f8'),
+    ('x', 'f8'),
+    ('y', 'f8'),
+    ('z', 'f8'),
+])
+
+
+@dataclass(frozen=True)
 class Waypoint:
     """Represents a 3D waypoint with spatial coordinates."""
+    __slots__ = ('x', 'y', 'z')
+    
     x: float
     y: float
     z: float
@@ -18,38 +32,101 @@ class Waypoint:
         """Convert waypoint to numpy array."""
         return np.array([self.x, self.y, self.z])
     
+    def as_tuple(self) -> Tuple[float, float, float]:
+        """Return coordinates as a plain tuple (no array allocation)."""
+        return (self.x, self.y, self.z)
+    
+    def __reduce__(self):
+        # Frozen with hand-written slots, so the default slot-state pickling
+        # would go through the blocked __setattr__; rebuild through __init__
+        return (self.__class__, (self.x, self.y, self.z))
+    
     def __repr__(self):
         return f"Waypoint(x={self.x:.1f}, y={self.y:.1f}, z={self.z:.1f})"
 
 
 @dataclass
 class Mission:
-    """Represents a drone mission with waypoints and time window."""
-    waypoints: List[Waypoint]
+    """
+    Represents a drone mission with waypoints and time window.
+    
+    Waypoints are the construction format; internally the path is held as a
+    single (N, 3) coordinate array (see `points`).
+    """
+    waypoints: Sequence[Waypoint]
     start_time: float
     end_time: float
     mission_id: str = "PRIMARY"
+    _pts: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _cum: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _node_fracs: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        # Waypoints are frozen and stored as a tuple, so the path only changes
+        # by reassignment, which drops the cached arrays
+        if name == 'waypoints':
+            value = tuple(value)
+            object.__setattr__(self, '_pts', None)
+        object.__setattr__(self, name, value)
     
     def duration(self) -> float:
         """Calculate mission duration."""
         return self.end_time - self.start_time
     
+    @property
+    def points(self) -> np.ndarray:
+        """Waypoint coordinates as a read-only, contiguous (N, 3) float64 array."""
+        self._ensure_arrays()
+        return self._pts
+    
+    def _node_times(self) -> np.ndarray:
+        """Absolute time at which each waypoint is reached (current schedule)."""
+        self._ensure_arrays()
+        return self.start_time + self._node_fracs * self.duration()
+    
+    def _ensure_arrays(self):
+        """Build waypoint coordinates, cumulative path lengths and node fractions once."""
+        if self._pts is None:
+            self._pts = np.array([[w.x, w.y, w.z] for w in self.waypoints], dtype=np.float64)
+            self._cum = np.concatenate(
+                [[0.0], np.cumsum(np.linalg.norm(np.diff(self._pts, axis=0), axis=1))]
+            )
+            # Constant speed: fraction of the mission elapsed at each waypoint.
+            # Kept normalized so rescheduling start/end_time never stales it.
+            total = self._cum[-1]
+            if total > 0:
+                self._node_fracs = self._cum / total
+            else:
+                self._node_fracs = np.zeros(len(self._pts))
+            # The cache is shared with callers through `points`; writes would
+            # silently desync it from the waypoints
+            for arr in (self._pts, self._cum, self._node_fracs):
+                arr.flags.writeable = False
+    
     def __repr__(self):
         return f"Mission(id={self.mission_id}, waypoints={len(self.waypoints)}, duration={self.duration():.1f}s)"
 
 
 @dataclass
-class Conflict:
-    """Represents a detected conflict between drones."""
-    time: float
+class ConflictWindow:
+    """A consolidated time window during which one flight violates the buffer."""
+    __slots__ = ('start_time', 'end_time', 'location', 'min_distance',
+                 'flight_id', 'flight_name')
+    
+    start_time: float
+    end_time: float
     location: Waypoint
-    distance: float
-    primary_position: Waypoint
-    other_position: Waypoint
+    min_distance: float
     flight_id: str
     flight_name: str
     
-    def __repr__(self):
-        return (f"Conflict(time={self.time:.1f}s, distance={self.distance:.2f}m, "
-                f"flight={self.flight_name}, location={self.location})")
-
+    def to_dict(self) -> Dict:
+        """Convert to the dictionary format used in deconfliction reports."""
+        return {
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'location': self.location,
+            'min_distance': self.min_distance,
+            'flight_id': self.flight_id,
+            'flight_name': self.flight_name
+        }
@@ -19,9 +19,8 @@ class Visualizer:
     def __init__(self, deconfliction_system: DeconflictionSystem):
         self.system = deconfliction_system
         
-        # Create output directory if it doesn't exist
-        if not os.path.exists('output'):
-            os.makedirs('output')
+        # Create output directory if it doesn't exist (safe across worker processes)
+        os.makedirs('output', exist_ok=True)
     
     def plot_3d_static(self, primary_mission: Mission, 
                        simulated_flights: List[Mission],
@@ -40,14 +39,14 @@ class Visualizer:
         ax = fig.add_subplot(111, projection='3d')
         
         # Plot primary mission
-        primary_path = np.array([wp.to_array() for wp in primary_mission.waypoints])
+        primary_path = primary_mission.points
         ax.plot(primary_path[:, 0], primary_path[:, 1], primary_path[:, 2],
                 'b-', linewidth=3, label='Primary Mission', marker='o', markersize=8)
         
         # Plot simulated flights
         colors = ['r', 'orange', 'purple', 'brown', 'pink']
         for i, flight in enumerate(simulated_flights):
-            flight_path = np.array([wp.to_array() for wp in flight.waypoints])
+            flight_path = flight.points
             ax.plot(flight_path[:, 0], flight_path[:, 1], flight_path[:, 2],
                     color=colors[i % len(colors)], linestyle='--', linewidth=2,
                     label=f'Flight {flight.mission_id}', marker='s', markersize=5)
@@ -71,9 +70,8 @@ class Visualizer:
         ax.grid(True, alpha=0.3)
         
         # Set equal aspect ratio
-        all_points = primary_path
-        for flight in simulated_flights:
-            all_points = np.vstack([all_points, np.array([wp.to_array() for wp in flight.waypoints])])
+        all_points = np.concatenate(
+            [primary_path] + [flight.points for flight in simulated_flights], axis=0)
         
         max_range = np.array([
             all_points[:, 0].max() - all_points[:, 0].min(),
@@ -94,13 +92,15 @@ class Visualizer:
         if save_path:
             plt.savefig(save_path, dpi=300, bbox_inches='tight')
             print(f"✓ Saved 3D visualization to {save_path}")
+            plt.close(fig)
         else:
             plt.show()
     
     def create_animation(self, primary_mission: Mission,
                         simulated_flights: List[Mission],
                         result: Dict,
-                        save_path: Optional[str] = None):
+                        save_path: Optional[str] = None,
+                        dpi: int = 80):
         """
         Create animated 4D visualization of drone missions over time.
         
@@ -109,18 +109,19 @@ class Visualizer:
             simulated_flights: Other drone flights
             result: Deconfliction result
             save_path: Optional path to save animation
+            dpi: Resolution of the saved GIF frames
         """
         fig = plt.figure(figsize=(14, 10))
         ax = fig.add_subplot(111, projection='3d')
         
         # Plot paths (faded)
-        primary_path = np.array([wp.to_array() for wp in primary_mission.waypoints])
+        primary_path = primary_mission.points
         ax.plot(primary_path[:, 0], primary_path[:, 1], primary_path[:, 2],
                 'b-', linewidth=2, alpha=0.3, label='Primary Path')
         
         colors = ['r', 'orange', 'purple', 'brown']
         for i, flight in enumerate(simulated_flights):
-            flight_path = np.array([wp.to_array() for wp in flight.waypoints])
+            flight_path = flight.points
             ax.plot(flight_path[:, 0], flight_path[:, 1], flight_path[:, 2],
                     color=colors[i % len(colors)], linestyle='--', 
                     linewidth=2, alpha=0.3, label=f'Flight {flight.mission_id}')
@@ -135,6 +136,7 @@ class Visualizer:
                            color=colors[i % len(colors)],
                            markeredgecolor='black', markeredgewidth=1)
             other_drones.append(drone)
+        drones = [primary_drone] + other_drones
         
         # Conflict zone marker
         conflict_zone, = ax.plot([], [], [], 'ro', markersize=35, 
@@ -149,49 +151,47 @@ class Visualizer:
                                fontsize=12, fontweight='bold')
         
         def init():
-            primary_drone.set_data([], [])
-            primary_drone.set_3d_properties([])
-            for drone in other_drones:
-                drone.set_data([], [])
-                drone.set_3d_properties([])
-            conflict_zone.set_data([], [])
-            conflict_zone.set_3d_properties([])
-            return [primary_drone] + other_drones + [conflict_zone, time_text, status_text]
+            for drone in drones:
+                drone.set_data_3d([], [], [])
+            conflict_zone.set_data_3d([], [], [])
+            return drones + [conflict_zone, time_text, status_text]
+        
+        # Precompute every drone's trajectory over all frames (NaN = not airborne)
+        num_frames = int((primary_mission.end_time - primary_mission.start_time) / 0.5)
+        frame_times = primary_mission.start_time + np.arange(num_frames) * 0.5
+        trajectories = np.empty((len(simulated_flights) + 1, num_frames, 3))
+        trajectories[0] = self.system.interpolate_positions(primary_mission, frame_times)
+        for i, flight in enumerate(simulated_flights):
+            trajectories[i + 1] = self.system.interpolate_positions(flight, frame_times)
+        airborne = ~np.isnan(trajectories[:, :, 0])
+        
+        # Map each frame to the first conflict window covering it (-1 = none).
+        # Windows are painted last-to-first so earlier windows take precedence.
+        conflicts = result['conflicts']
+        conflict_locations = np.array([c['location'].as_tuple() for c in conflicts]).reshape(-1, 3)
+        frame_conflict = np.full(num_frames, -1)
+        for c in range(len(conflicts) - 1, -1, -1):
+            lo = np.searchsorted(frame_times, conflicts[c]['start_time'], side='left')
+            hi = np.searchsorted(frame_times, conflicts[c]['end_time'], side='right')
+            frame_conflict[lo:hi] = c
         
         def animate(frame):
-            current_time = primary_mission.start_time + frame * 0.5
-            
-            # Update primary drone
-            primary_pos = self.system.interpolate_position(primary_mission, current_time)
-            if primary_pos:
-                primary_drone.set_data([primary_pos.x], [primary_pos.y])
-                primary_drone.set_3d_properties([primary_pos.z])
-            else:
-                primary_drone.set_data([], [])
-                primary_drone.set_3d_properties([])
+            current_time = frame_times[frame]
             
-            # Update other drones
-            for i, flight in enumerate(simulated_flights):
-                pos = self.system.interpolate_position(flight, current_time)
-                if pos:
-                    other_drones[i].set_data([pos.x], [pos.y])
-                    other_drones[i].set_3d_properties([pos.z])
+            # Update drone markers (primary first)
+            for k, drone in enumerate(drones):
+                if airborne[k, frame]:
+                    drone.set_data_3d(trajectories[k, frame:frame + 1].T)
                 else:
-                    other_drones[i].set_data([], [])
-                    other_drones[i].set_3d_properties([])
-            
-            # Check for conflicts at current time
-            in_conflict = False
-            for conflict in result['conflicts']:
-                if conflict['start_time'] <= current_time <= conflict['end_time']:
-                    in_conflict = True
-                    conflict_zone.set_data([conflict['location'].x], [conflict['location'].y])
-                    conflict_zone.set_3d_properties([conflict['location'].z])
-                    break
+                    drone.set_data_3d([], [], [])
             
-            if not in_conflict:
-                conflict_zone.set_data([], [])
-                conflict_zone.set_3d_properties([])
+            # Active conflict window at current time (precomputed)
+            c = frame_conflict[frame]
+            in_conflict = c >= 0
+            if in_conflict:
+                conflict_zone.set_data_3d(conflict_locations[c:c + 1].T)
+            else:
+                conflict_zone.set_data_3d([], [], [])
             
             time_text.set_text(f'Time: {current_time:.1f}s / {primary_mission.end_time:.1f}s')
             status = '⚠ CONFLICT DETECTED' if in_conflict else '✓ Clear'
@@ -199,7 +199,7 @@ class Visualizer:
             status_text.set_text(f'Status: {status}')
             status_text.set_color(status_color)
             
-            return [primary_drone] + other_drones + [conflict_zone, time_text, status_text]
+            return drones + [conflict_zone, time_text, status_text]
         
         # Set up axes
         ax.set_xlabel('X (meters)', fontsize=12, labelpad=10)
@@ -211,9 +211,8 @@ class Visualizer:
         ax.grid(True, alpha=0.3)
         
         # Set limits
-        all_points = primary_path
-        for flight in simulated_flights:
-            all_points = np.vstack([all_points, np.array([wp.to_array() for wp in flight.waypoints])])
+        all_points = np.concatenate(
+            [primary_path] + [flight.points for flight in simulated_flights], axis=0)
         
         margin = 50
         ax.set_xlim(all_points[:, 0].min() - margin, all_points[:, 0].max() + margin)
@@ -221,14 +220,14 @@ class Visualizer:
         ax.set_zlim(all_points[:, 2].min() - margin, all_points[:, 2].max() + margin)
         
         # Create animation
-        num_frames = int((primary_mission.end_time - primary_mission.start_time) / 0.5)
         anim = FuncAnimation(fig, animate, init_func=init, frames=num_frames,
                            interval=50, blit=True, repeat=True)
         
         if save_path:
             writer = PillowWriter(fps=20)
-            anim.save(save_path, writer=writer)
+            anim.save(save_path, writer=writer, dpi=dpi)
             print(f"✓ Saved animation to {save_path}")
+            plt.close(fig)
         else:
             plt.show()
 